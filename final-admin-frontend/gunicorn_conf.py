@@ -0,0 +1,19 @@
+"""Gunicorn settings for the admin AI analysis service.
+
+Usage: ``gunicorn -c gunicorn_conf.py server.app:app``
+"""
+from gevent import monkey
+
+# Patch before the app (and its sockets) are imported by the workers.
+monkey.patch_all()
+
+import os  # noqa: E402
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+# gevent only helps the IO-bound routes; /ai-analysis is CPU-bound and scales
+# with the worker count. cpu_count() reports host CPUs inside Render
+# containers, and each worker loads numba, so size via WEB_CONCURRENCY.
+worker_class = "gevent"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_connections = 200
+keepalive = 5
@@ -6,11 +6,29 @@ structured findings that the React ``AIAnalysisModal`` can render.
 """
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, TypedDict
 
-UNCERTAINTY_TERMS = {
+try:  # optional C accelerator for multi-term matching
+    import ahocorasick
+except ImportError:  # pragma: no cover - fallback exercised when not installed
+    ahocorasick = None
+
+try:  # optional JIT for the numeric scoring kernels
+    from numba import njit
+except ImportError:  # pragma: no cover - fallback exercised when not installed
+    njit = None
+
+UNCERTAINTY_TERMS = frozenset({
     "maybe",
     "not sure",
     "unsure",
@@ -23,9 +41,9 @@ UNCERTAINTY_TERMS = {
     "looks like",
     "i think",
     "might",
-}
+})
 
-CONCRETE_DETAIL_TERMS = {
+CONCRETE_DETAIL_TERMS = frozenset({
     "lane",
     "km",
     "exit",
@@ -37,20 +55,212 @@ CONCRETE_DETAIL_TERMS = {
     "avenue",
     "road",
     "street",
-}
+})
 
-MEDIA_HINT_TERMS = {
+MEDIA_HINT_TERMS = frozenset({
     "see photo",
     "attached",
     "image",
     "video",
     "screenshot",
-}
+})
+
+# Shortest first so the fallback counter can stop once terms outgrow the text.
+UNCERTAINTY_TERMS_T = tuple(sorted(UNCERTAINTY_TERMS, key=lambda t: (len(t), t)))
+CONCRETE_DETAIL_TERMS_T = tuple(sorted(CONCRETE_DETAIL_TERMS, key=lambda t: (len(t), t)))
+MEDIA_HINT_TERMS_T = tuple(sorted(MEDIA_HINT_TERMS, key=lambda t: (len(t), t)))
 
 SEVERITY_ORDER = {"low": 0, "medium": 1, "moderate": 1, "high": 2, "critical": 3}
 
 RESPONSE_LABELS = ["Suspicious", "Needs Review", "Likely Authentic"]
 
+# The "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%SZ" and
+# "%Y-%m-%dT%H:%M:%S.%fZ" layouts; use with fullmatch.  Like strptime,
+# literals match case-insensitively, the space matches any whitespace run and
+# the day may be space-padded.
+_DATETIME_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2}| \d)"
+    r"(?:T(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.(\d{1,6}))?Z"
+    r"|\s+(\d{1,2}):(\d{1,2}):(\d{1,2}))?",
+    re.IGNORECASE,
+)
+
+# Term-set ids used as automaton payloads and counter indices.
+_UNCERTAINTY, _EVIDENCE, _CONCRETE = 0, 1, 2
+
+
+def _build_automaton():
+    """Compile every term set into one Aho-Corasick automaton, if available."""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for set_id, terms in (
+        (_UNCERTAINTY, UNCERTAINTY_TERMS),
+        (_EVIDENCE, MEDIA_HINT_TERMS),
+        (_CONCRETE, CONCRETE_DETAIL_TERMS),
+    ):
+        for term in terms:
+            automaton.add_word(term, (set_id, len(term)))
+    automaton.make_automaton()
+    return automaton
+
+
+_AC = _build_automaton()
+
+CREATED_AT_KEYS = ("createdAt", "created_at", "reported_at")
+
+ANALYSIS_CACHE_SIZE = 2048
+# Results echo client text back; larger ones are not kept in the cache.
+ANALYSIS_CACHE_MAX_CHARS = 4096
+_ECHOED_FEATURES = ("description", "type", "severity", "location")
+
+# Shared "now" refreshed at most once a minute: [monotonic stamp, utc datetime].
+_NOW_CACHE: List = [0.0, None]
+_NOW_TTL_SECONDS = 60
+
+
+def _now() -> datetime:
+    """Return a UTC timestamp cached at roughly one-minute resolution."""
+    stamp = time.monotonic()
+    if _NOW_CACHE[1] is None or stamp - _NOW_CACHE[0] > _NOW_TTL_SECONDS:
+        _NOW_CACHE[0] = stamp
+        _NOW_CACHE[1] = datetime.utcnow()
+    return _NOW_CACHE[1]
+
+
+_NAN = float("nan")
+
+# Signal bits returned by the scoring kernels, listed in report order.
+AUTHENTICITY_SIGNALS = (
+    (1 << 0, "Photo evidence provided"),
+    (1 << 1, "Specific details detected in description"),
+    (1 << 2, "Uncertainty language used"),
+    (1 << 3, "Severe incident reported with little context"),
+    (1 << 4, "Previously verified by moderators"),
+    (1 << 5, "Reporter has strong reputation"),
+    (1 << 6, "Reporter flagged with low reputation"),
+)
+
+QUALITY_SIGNALS = (
+    (1 << 0, "Detailed description (>20 words)"),
+    (1 << 1, "Very short description (<8 words)"),
+    (1 << 2, "Contains concrete location cues"),
+    (1 << 3, "Includes supporting photo evidence"),
+    (1 << 4, "Mentions attached media"),
+    (1 << 5, "Uses uncertainty language"),
+    (1 << 6, "Reported within the last 3 hours"),
+    (1 << 7, "Report is older than 24 hours"),
+)
+
+
+# Reputation bonus indexed low (<=0.3) / neutral / strong (>=0.7).
+REPUTATION_BONUS = (-7, 0, 5)
+REPUTATION_SIGNAL = (1 << 6, 0, 1 << 5)
+
+# Recency bonus by whole hour (rounded up): <=3h rewarded, >24h penalised.
+RECENCY_BUCKETS = 26
+RECENCY_BONUS = tuple([5] * 4 + [0] * 21 + [-4])
+RECENCY_SIGNAL = tuple([1 << 6] * 4 + [0] * 21 + [1 << 7])
+
+
+def _authenticity_core(
+    has_photo, has_digits, concrete, uncertainty, severity_rank, word_count,
+    has_verified, reputation,
+):
+    """Return ``(score, signal_mask)``; a NaN reputation means "unknown"."""
+    score = 58.0
+    mask = 0
+
+    if has_photo:
+        score += 12
+        mask |= 1 << 0
+
+    if has_digits or concrete >= 2:
+        score += 10
+        mask |= 1 << 1
+
+    if uncertainty:
+        score -= min(18, uncertainty * 6)
+        mask |= 1 << 2
+
+    if severity_rank >= 2 and word_count < 12:
+        score -= 10
+        mask |= 1 << 3
+
+    if has_verified:
+        score += 6
+        mask |= 1 << 4
+
+    # NaN fails both comparisons and lands on the neutral entry.
+    index = int(reputation >= 0.7) - int(reputation <= 0.3) + 1
+    score += REPUTATION_BONUS[index]
+    mask |= REPUTATION_SIGNAL[index]
+
+    return max(0, min(100, int(round(score)))), mask
+
+
+def _quality_core(has_photo, concrete, uncertainty, evidence, word_count, recency):
+    """Return ``(score, signal_mask)``; a NaN recency means "unknown"."""
+    score = 55.0
+    mask = 0
+
+    if word_count >= 20:
+        score += 8
+        mask |= 1 << 0
+    elif word_count < 8:
+        score -= 8
+        mask |= 1 << 1
+
+    if concrete >= 2:
+        score += 6
+        mask |= 1 << 2
+
+    if has_photo:
+        score += 10
+        mask |= 1 << 3
+
+    if evidence:
+        score += 4
+        mask |= 1 << 4
+
+    if uncertainty:
+        score -= min(12, uncertainty * 4)
+        mask |= 1 << 5
+
+    if recency == recency:  # skip NaN
+        index = min(max(math.ceil(recency), 0), RECENCY_BUCKETS - 1)
+        score += RECENCY_BONUS[index]
+        mask |= RECENCY_SIGNAL[index]
+
+    return max(0, min(100, int(round(score)))), mask
+
+
+if njit is not None:
+    _authenticity_core = njit(cache=True)(_authenticity_core)
+    _quality_core = njit(cache=True)(_quality_core)
+
+
+class FeatureSummary(TypedDict):
+    """Primitive-only feature map; JSON-ready without further conversion."""
+
+    description: str
+    word_count: int
+    char_count: int
+    uncertainty_terms: int
+    evidence_terms: int
+    concrete_terms: int
+    has_digits: bool
+    has_photo: bool
+    severity: str
+    severity_rank: int
+    type: str
+    location: str
+    has_tags: bool
+    has_verified_tag: bool
+    reporter_reputation: Optional[float]
+    recency_hours: Optional[float]
+
 
 @dataclass
 class NormalisedIncident:
@@ -70,6 +280,10 @@ class NormalisedIncident:
     def has_photo(self) -> bool:
         return bool(self.photo_url)
 
+    @cached_property
+    def lowered_description(self) -> str:
+        return self.description.lower()
+
 
 class AIReportAnalyzer:
     """Rule-based incident analyser that mimics an AI assistant."""
@@ -79,6 +293,46 @@ class AIReportAnalyzer:
             "ready": True,
             "message": "Heuristic scoring engine initialised inside admin-frontend.",
         }
+        self._cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def cache_key(incident) -> bytes:
+        """Return a stable digest of an incident payload for result caching.
+
+        Payloads carrying a timestamp feed ``recency_hours``, so the current
+        minute is folded into their key to keep cached results fresh.
+        """
+        parts = [json.dumps(incident, sort_keys=True, default=str)]
+        if isinstance(incident, dict) and any(incident.get(k) for k in CREATED_AT_KEYS):
+            parts.append(str(int(time.time() // 60)))
+        return hashlib.blake2b("|".join(parts).encode()).digest()
+
+    def analyse_cached(self, key: bytes, incident: Dict) -> Dict:
+        """Return ``analyse(incident)``, reusing a prior result for ``key``.
+
+        Cached results are shared between callers and must not be mutated.
+        Results echoing more than ``ANALYSIS_CACHE_MAX_CHARS`` of client text
+        are returned without being cached.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self.analyse(incident)
+
+        features = result["feature_summary"]
+        if sum(len(features[name]) for name in _ECHOED_FEATURES) > ANALYSIS_CACHE_MAX_CHARS:
+            return result
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > ANALYSIS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
 
     # ------------------------------------------------------------------
     def analyse(self, incident: Dict) -> Dict:
@@ -108,34 +362,30 @@ class AIReportAnalyzer:
         if not isinstance(incident, dict):
             raise ValueError("Incident payload must be an object")
 
-        description = self._first_truthy(
-            incident.get("description"),
-            incident.get("message"),
-            "",
+        description = incident.get("description") or incident.get("message") or ""
+        type_value = (
+            incident.get("incidentType")
+            or incident.get("type")
+            or incident.get("category")
+            or "unknown"
         )
-        type_value = self._first_truthy(
-            incident.get("incidentType"),
-            incident.get("type"),
-            incident.get("category"),
-            "unknown",
+        severity_value = (
+            incident.get("severity")
+            or incident.get("incident_severity")
+            or incident.get("level")
+            or "medium"
         )
-        severity_value = self._first_truthy(
-            incident.get("severity"),
-            incident.get("incident_severity"),
-            incident.get("level"),
-            "medium",
+        location = (
+            incident.get("location")
+            or incident.get("road_name")
+            or incident.get("road")
+            or ""
         )
-        location = self._first_truthy(
-            incident.get("location"),
-            incident.get("road_name"),
-            incident.get("road"),
-            "",
-        )
-        full_address = self._first_truthy(
-            incident.get("fullAddress"),
-            incident.get("address"),
-            incident.get("place"),
-            location,
+        full_address = (
+            incident.get("fullAddress")
+            or incident.get("address")
+            or incident.get("place")
+            or location
         )
 
         tags_field = incident.get("tags")
@@ -180,15 +430,15 @@ class AIReportAnalyzer:
         )
 
     # ------------------------------------------------------------------
-    def _extract_features(self, incident: NormalisedIncident) -> Dict[str, object]:
-        words = [w for w in incident.description.split() if w]
-        word_count = len(words)
+    def _extract_features(self, incident: NormalisedIncident) -> FeatureSummary:
+        lowered = incident.lowered_description
+        word_count = len(lowered.split())
         char_count = len(incident.description)
 
-        uncertainty_hits = self._count_terms(incident.description, UNCERTAINTY_TERMS)
-        evidence_terms = self._count_terms(incident.description, MEDIA_HINT_TERMS)
-        concrete_terms = self._count_terms(incident.description, CONCRETE_DETAIL_TERMS)
-        has_digits = any(ch.isdigit() for ch in incident.description)
+        uncertainty_hits, evidence_terms, concrete_terms = self._count_term_sets(
+            lowered
+        )
+        has_digits = any(map(str.isdigit, lowered))
 
         severity_rank = SEVERITY_ORDER.get(incident.severity, 1)
         has_tags = bool(incident.tags)
@@ -196,8 +446,9 @@ class AIReportAnalyzer:
 
         recency_hours = None
         if incident.created_at:
+            # Quantised to 0.1h so clock drift does not change the result.
             recency_hours = max(
-                (datetime.utcnow() - incident.created_at).total_seconds() / 3600.0,
+                round((_now() - incident.created_at).total_seconds() / 3600.0, 1),
                 0,
             )
 
@@ -221,55 +472,34 @@ class AIReportAnalyzer:
         }
 
     # ------------------------------------------------------------------
-    def _score_authenticity(self, features: Dict[str, object]) -> Dict[str, object]:
-        score = 58.0
-        confidence_weighting: Dict[str, float] = {
-            "Likely Authentic": 0.33,
-            "Needs Review": 0.34,
-            "Suspicious": 0.33,
-        }
-
-        adjustments: List[str] = []
-
-        if features["has_photo"]:
-            score += 12
-            adjustments.append("Photo evidence provided")
-            confidence_weighting["Likely Authentic"] += 0.1
-            confidence_weighting["Suspicious"] -= 0.05
-
-        if features["has_digits"] or features["concrete_terms"] >= 2:
-            score += 10
-            adjustments.append("Specific details detected in description")
-            confidence_weighting["Likely Authentic"] += 0.06
-            confidence_weighting["Needs Review"] -= 0.03
-
-        if features["uncertainty_terms"]:
-            penalty = min(18, features["uncertainty_terms"] * 6)
-            score -= penalty
-            adjustments.append("Uncertainty language used")
-            confidence_weighting["Suspicious"] += 0.08
-            confidence_weighting["Likely Authentic"] -= 0.04
-
-        if features["severity_rank"] >= 2 and features["word_count"] < 12:
-            score -= 10
-            adjustments.append("Severe incident reported with little context")
-            confidence_weighting["Suspicious"] += 0.05
-
-        if features["has_verified_tag"]:
-            score += 6
-            adjustments.append("Previously verified by moderators")
-            confidence_weighting["Likely Authentic"] += 0.05
-
+    def _score_authenticity(self, features: FeatureSummary) -> Dict[str, object]:
         reputation = features.get("reporter_reputation")
-        if reputation is not None:
-            if reputation >= 0.7:
-                score += 5
-                adjustments.append("Reporter has strong reputation")
-            elif reputation <= 0.3:
-                score -= 7
-                adjustments.append("Reporter flagged with low reputation")
-
-        score = max(0, min(100, round(score)))
+        score, mask = _authenticity_core(
+            bool(features["has_photo"]),
+            bool(features["has_digits"]),
+            features["concrete_terms"],
+            features["uncertainty_terms"],
+            features["severity_rank"],
+            features["word_count"],
+            bool(features["has_verified_tag"]),
+            _NAN if reputation is None else float(reputation),
+        )
+        adjustments = [text for bit, text in AUTHENTICITY_SIGNALS if mask & bit]
+
+        authentic, review, suspicious = 0.33, 0.34, 0.33
+        if mask & (1 << 0):
+            authentic += 0.1
+            suspicious -= 0.05
+        if mask & (1 << 1):
+            authentic += 0.06
+            review -= 0.03
+        if mask & (1 << 2):
+            suspicious += 0.08
+            authentic -= 0.04
+        if mask & (1 << 3):
+            suspicious += 0.05
+        if mask & (1 << 4):
+            authentic += 0.05
 
         label = RESPONSE_LABELS[1]
         if score >= 75:
@@ -277,10 +507,11 @@ class AIReportAnalyzer:
         elif score <= 45:
             label = RESPONSE_LABELS[0]
 
-        normaliser = sum(confidence_weighting.values()) or 1.0
+        normaliser = authentic + review + suspicious or 1.0
         confidence = {
-            key: max(0.0, round(value / normaliser, 3))
-            for key, value in confidence_weighting.items()
+            "Likely Authentic": max(0.0, round(authentic / normaliser, 3)),
+            "Needs Review": max(0.0, round(review / normaliser, 3)),
+            "Suspicious": max(0.0, round(suspicious / normaliser, 3)),
         }
 
         return {
@@ -291,52 +522,24 @@ class AIReportAnalyzer:
         }
 
     # ------------------------------------------------------------------
-    def _score_quality(self, features: Dict[str, object]) -> Dict[str, object]:
-        score = 55.0
-        signals: List[str] = []
-
-        if features["word_count"] >= 20:
-            score += 8
-            signals.append("Detailed description (>20 words)")
-        elif features["word_count"] < 8:
-            score -= 8
-            signals.append("Very short description (<8 words)")
-
-        if features["concrete_terms"] >= 2:
-            score += 6
-            signals.append("Contains concrete location cues")
-
-        if features["has_photo"]:
-            score += 10
-            signals.append("Includes supporting photo evidence")
-
-        if features["evidence_terms"]:
-            score += 4
-            signals.append("Mentions attached media")
-
-        if features["uncertainty_terms"]:
-            penalty = min(12, features["uncertainty_terms"] * 4)
-            score -= penalty
-            signals.append("Uses uncertainty language")
-
+    def _score_quality(self, features: FeatureSummary) -> Dict[str, object]:
         recency = features.get("recency_hours")
-        if recency is not None:
-            if recency <= 3:
-                score += 5
-                signals.append("Reported within the last 3 hours")
-            elif recency > 24:
-                score -= 4
-                signals.append("Report is older than 24 hours")
-
-        score = max(0, min(100, round(score)))
+        score, mask = _quality_core(
+            bool(features["has_photo"]),
+            features["concrete_terms"],
+            features["uncertainty_terms"],
+            features["evidence_terms"],
+            features["word_count"],
+            _NAN if recency is None else float(recency),
+        )
 
         return {
             "score": score,
-            "signals": signals,
+            "signals": [text for bit, text in QUALITY_SIGNALS if mask & bit],
         }
 
     # ------------------------------------------------------------------
-    def _detect_red_flags(self, features: Dict[str, object]) -> List[str]:
+    def _detect_red_flags(self, features: FeatureSummary) -> List[str]:
         red_flags: List[str] = []
 
         if features["uncertainty_terms"] >= 2:
@@ -376,7 +579,7 @@ class AIReportAnalyzer:
     # ------------------------------------------------------------------
     def _build_reasoning(
         self,
-        features: Dict[str, object],
+        features: FeatureSummary,
         authenticity: Dict[str, object],
         quality: Dict[str, object],
         red_flags: List[str],
@@ -410,13 +613,6 @@ class AIReportAnalyzer:
         return " ".join(fragments)
 
     # ------------------------------------------------------------------
-    @staticmethod
-    def _first_truthy(*values):
-        for value in values:
-            if value:
-                return value
-        return ""
-
     @staticmethod
     def _parse_datetime(value) -> Optional[datetime]:
         if isinstance(value, datetime):
@@ -429,22 +625,51 @@ class AIReportAnalyzer:
                 return None
 
         if isinstance(value, str):
-            for fmt in (
-                "%Y-%m-%dT%H:%M:%S.%fZ",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d",
-            ):
-                try:
-                    return datetime.strptime(value, fmt)
-                except ValueError:
-                    continue
+            match = _DATETIME_RE.fullmatch(value)
+            if match is None:
+                return None
+            year, month, day, hour, minute, second, fraction, *spaced = match.groups()
+            if spaced[0] is not None:
+                hour, minute, second = spaced
+            try:
+                return datetime(
+                    int(year),
+                    int(month),
+                    int(day),
+                    int(hour or 0),
+                    int(minute or 0),
+                    int(second or 0),
+                    int((fraction or "0").ljust(6, "0")),
+                )
+            except ValueError:
+                return None
         return None
 
     @staticmethod
-    def _count_terms(text: str, terms: Iterable[str]) -> int:
-        lowered = text.lower()
-        return sum(lowered.count(term) for term in terms)
+    def _count_term_sets(lowered: str) -> List[int]:
+        """Count uncertainty, evidence and concrete terms in one pass."""
+        if _AC is None:
+            return [
+                AIReportAnalyzer._count_terms(lowered, UNCERTAINTY_TERMS_T),
+                AIReportAnalyzer._count_terms(lowered, MEDIA_HINT_TERMS_T),
+                AIReportAnalyzer._count_terms(lowered, CONCRETE_DETAIL_TERMS_T),
+            ]
+
+        counts = [0, 0, 0]
+        for _end, (set_id, _length) in _AC.iter(lowered):
+            counts[set_id] += 1
+        return counts
+
+    @staticmethod
+    def _count_terms(lowered: str, terms: Iterable[str]) -> int:
+        """Count term occurrences; ``terms`` must be sorted by length ascending."""
+        n = len(lowered)
+        total = 0
+        for term in terms:
+            if len(term) > n:
+                break
+            total += lowered.count(term)
+        return total
 
 
 __all__ = ["AIReportAnalyzer"]
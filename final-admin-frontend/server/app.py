@@ -6,11 +6,12 @@ application's backend codebase.
 """
 from __future__ import annotations
 
-from dataclasses import asdict
 from typing import Any
 import os
+import sys
 
-from flask import Flask, jsonify, request, send_from_directory
+import orjson
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 
 from .analyzer import AIReportAnalyzer
@@ -49,7 +50,7 @@ def run_analysis():
         )
 
     try:
-        analysis = _analyzer.analyse(incident)
+        analysis = _analyzer.analyse_cached(_analyzer.cache_key(incident), incident)
     except ValueError as exc:  # validation errors from the analyzer
         return jsonify({"status": "error", "error": str(exc)}), 400
     except Exception as exc:  # unexpected errors are surfaced with minimal context
@@ -58,9 +59,9 @@ def run_analysis():
             500,
         )
 
-    # Dataclasses appear within the feature summary; normalise for JSON.
-    serialised = _serialise(analysis)
-    return jsonify({"status": "success", "analysis": serialised})
+    # The analysis is built from primitives only (see FeatureSummary), so it
+    # is encoded directly.
+    return _orjson_response({"status": "success", "analysis": analysis})
 
 
 # Serve React App in production
@@ -77,17 +78,22 @@ def serve_react(path):
         return send_from_directory(app.static_folder, 'index.html')
 
 
-def _serialise(obj: Any) -> Any:
-    """Recursively convert dataclass instances within nested structures."""
-    if hasattr(obj, "__dataclass_fields__"):
-        return {key: _serialise(value) for key, value in asdict(obj).items()}
-    if isinstance(obj, dict):
-        return {key: _serialise(value) for key, value in obj.items()}
-    if isinstance(obj, list):
-        return [_serialise(value) for value in obj]
-    return obj
+def _orjson_default(obj: Any) -> Any:
+    """Reject objects orjson cannot encode natively (it handles dataclasses)."""
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_response(payload: Any, status: int = 200) -> Response:
+    """Build a JSON response with orjson instead of Flask's stdlib encoder."""
+    body = orjson.dumps(payload, default=_orjson_default)
+    return Response(body, status=status, mimetype="application/json")
 
 
 if __name__ == "__main__":
+    print(
+        "Running the Flask development server is deprecated; "
+        "use 'gunicorn -c gunicorn_conf.py server.app:app' instead.",
+        file=sys.stderr,
+    )
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -1,13 +1,22 @@
-!pip install supabase
-
+!pip install supabase pyahocorasick
+
+import functools
+import hashlib
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+import ahocorasick
 import pandas as pd
 import numpy as np
 import requests
+import torch
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from sentence_transformers import SentenceTransformer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import StratifiedKFold, train_test_split
-from sklearn.decomposition import TruncatedSVD
 from sklearn.metrics import classification_report, f1_score
 from supabase import create_client, Client
 
@@ -56,158 +65,283 @@ keyword_type_map = {
 ACCOUNT_KEY = "orxOhzCKSY+kXRrlIyWWrQ=="
 BASE_URL = "https://datamall2.mytransport.sg/ltaodataservice/v4/TrafficSpeedBands"
 
+LTA_TTL_SECONDS = 60
+
+# Shared keep-alive session for all LTA calls
+_LTA_SESSION = requests.Session()
+_LTA_SESSION.headers.update({"AccountKey": ACCOUNT_KEY, "accept": "application/json"})
+_LTA_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.2)),
+)
+
+@functools.lru_cache(maxsize=1)
+def _fetch_lta(ts_bucket):
+    # One LTA fetch per TTL bucket, indexed by lowercased road name (first entry wins)
+    resp = _LTA_SESSION.get(BASE_URL, timeout=5)
+    index = {}
+    for entry in resp.json().get("value", []):
+        index.setdefault(entry["RoadName"].lower(), entry)
+    return index
+
+def lta_road_index():
+    return _fetch_lta(int(time.time() // LTA_TTL_SECONDS))
+
 def get_live_speed(road_name):
-    headers = {"AccountKey": ACCOUNT_KEY, "accept": "application/json"}
     try:
-        resp = requests.get(BASE_URL, headers=headers)
-        data = resp.json().get("value", [])
-        for entry in data:
-            if road_name.lower() in entry["RoadName"].lower():
-                return entry["SpeedBand"]
-        return None
+        index = lta_road_index()
     except Exception as e:
         print("⚠️ Error fetching LTA data:", e)
         return None
 
+    road_lower = road_name.lower()
+    entry = index.get(road_lower)
+    if entry is None:
+        # Fall back to the original partial-name match
+        entry = next((e for name, e in index.items() if road_lower in name), None)
+    return entry["SpeedBand"] if entry else None
+
 # === Infer type from message ===
+# One automaton over all keywords; payload priority follows keyword_type_map order
+TYPE_AC = ahocorasick.Automaton()
+for priority, (keyword, typ) in enumerate(keyword_type_map.items()):
+    TYPE_AC.add_word(keyword, (priority, typ))
+TYPE_AC.make_automaton()
+
+def _match_type(msg_lower, default_type):
+    # Earliest keyword in map order wins, as with the original linear scan
+    best = min((hit for _end, hit in TYPE_AC.iter(msg_lower)), default=None)
+    return best[1] if best else default_type
+
 def infer_type_from_message(msg, default_type="Heavy Traffic"):
-    msg_lower = msg.lower()
-    for keyword, typ in keyword_type_map.items():
-        if keyword in msg_lower:
-            return typ
-    return default_type
+    return _match_type(msg.lower(), default_type)
+
+def infer_type_batch(msg_lower, default_type="Heavy Traffic"):
+    # Infer types for a Series of lowercased messages, one automaton pass per message
+    return msg_lower.fillna("").map(lambda m: _match_type(m, default_type))
 
 # === Fetch incidents from Supabase with batching ===
-def fetch_supabase_incidents(batch_size=1000):
-    offset = 0
-    all_data = []
-    while True:
-        response = supabase.table("incidents_duplicate").select("*").range(offset, offset + batch_size - 1).execute()
-        data = response.data
-        if not data:
-            break
-        all_data.extend(data)
-        offset += batch_size
-
-    df = pd.DataFrame(all_data)
+def fetch_incident_page(offset, batch_size):
+    return supabase.table("incidents_duplicate").select("*").range(offset, offset + batch_size - 1).execute().data
+
+def fetch_supabase_incidents(batch_size=1000, max_workers=8):
+    # First page also reports the total row count; remaining pages are fetched in parallel
+    first = (
+        supabase.table("incidents_duplicate")
+        .select("*", count="exact")
+        .range(0, batch_size - 1)
+        .execute()
+    )
+    pages = [first.data]
+    if first.count is not None:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            offsets = range(batch_size, first.count, batch_size)
+            pages.extend(ex.map(fetch_incident_page, offsets, itertools.repeat(batch_size)))
+
+    # Without a count, or for rows added after it, keep reading until a short page
+    while len(pages[-1]) == batch_size:
+        pages.append(fetch_incident_page(len(pages) * batch_size, batch_size))
+
+    df = pd.DataFrame(list(itertools.chain.from_iterable(pages)))
 
     # Feature engineering
     df["speed_band"] = df["severity"].str.lower().map(severity_map).fillna(5)
     df["type_score"] = df["type"].str.lower().map(type_map).fillna(0)
-    df["type_match_score"] = df.apply(
-        lambda x: 1 if infer_type_from_message(x["message"]).lower() == x["type"].lower() else 0, axis=1
-    )
-    df["uncertainty_score"] = df["message"].apply(
-        lambda msg: sum(word in msg.lower() for word in uncertainty_keywords) / len(uncertainty_keywords)
+    msg_lower = df["message"].str.lower()
+    df["type_match_score"] = (
+        infer_type_batch(msg_lower).str.lower().eq(df["type"].str.lower()).astype(int)
     )
+    df["uncertainty_score"] = sum(
+        msg_lower.str.contains(word, regex=False).astype(int) for word in uncertainty_keywords
+    ) / len(uncertainty_keywords)
     return df
 
 # === Encode text messages ===
-model_text = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "all-MiniLM-L6-v2"
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+PRECISION = "fp16" if DEVICE == "cuda" else "fp32"
+model_text = SentenceTransformer(MODEL_NAME, device=DEVICE)
+if DEVICE == "cuda":
+    model_text.half()
 
-# === Load data ===
-df = fetch_supabase_incidents()
-print("Fetched incidents:", len(df))
-print(df.head())
+# Embeddings persisted across runs, keyed by a hash of the message text.
+# One file per model and precision so FP16/FP32 or different models never mix.
+EMBEDDING_CACHE_PATH = f"message_embeddings-{MODEL_NAME}-{PRECISION}.npz"
 
-# === Feature engineering ===
-text_embeddings = model_text.encode(df["message"].tolist())
-numeric_features = df[["speed_band", "type_score", "type_match_score", "uncertainty_score"]].values
+def message_key(msg):
+    return hashlib.blake2b(msg.encode("utf-8"), digest_size=16).hexdigest()
 
-# === Labels ===
-le = LabelEncoder()
-labels = le.fit_transform(df["label"])  # 'verified' / 'false'
+def load_embedding_cache(path=EMBEDDING_CACHE_PATH):
+    try:
+        with np.load(path) as cached:
+            return dict(zip(cached["keys"].tolist(), cached["embeddings"]))
+    except FileNotFoundError:
+        return {}
+
+def save_embedding_cache(cache, path=EMBEDDING_CACHE_PATH):
+    keys = list(cache)
+    if keys:
+        np.savez(path, keys=np.array(keys), embeddings=np.stack([cache[k] for k in keys]))
+
+def encode_messages(msgs, cache=None):
+    # Encode each distinct message once, skipping any already in the cache
+    cache = {} if cache is None else cache
+    unique_msgs, inverse = np.unique(np.asarray(msgs, dtype=object), return_inverse=True)
+    keys = [message_key(m) for m in unique_msgs]
+    missing = {k: m for k, m in zip(keys, unique_msgs) if k not in cache}
+    if missing:
+        encoded = model_text.encode(
+            list(missing.values()),
+            batch_size=256,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).astype(np.float32)
+        cache.update(zip(missing.keys(), encoded))
+    return np.stack([cache[k] for k in keys])[inverse]
+
+def fit_embedding_ranges(embeddings):
+    # Per-dimension [min, max] used to calibrate int8 quantisation
+    return np.vstack([embeddings.min(axis=0), embeddings.max(axis=0)])
+
+def quantize(embeddings, ranges):
+    # int8 embeddings calibrated on the training set's per-dimension min/max;
+    # values outside the calibration range saturate instead of wrapping around
+    lo, hi = ranges
+    step = (hi - lo) / 255
+    step = np.where(step > 0, step, 1.0)
+    return np.clip(np.rint((embeddings - lo) / step) - 128, -128, 127).astype(np.int8)
+
+embedding_cache = load_embedding_cache()
+
+# === Trained artefacts persisted across runs ===
+CLF_PATH = "clf.joblib.gz"
+EMBEDDING_RANGES_PATH = "embedding_ranges.joblib"
+LABEL_ENCODER_PATH = "label_encoder.joblib"
+
+def train_and_dump():
+    # === Load data ===
+    df = fetch_supabase_incidents()
+    print("Fetched incidents:", len(df))
+    print(df.head())
+
+    # === Feature engineering ===
+    raw_embeddings = encode_messages(df["message"].tolist(), embedding_cache)
+    save_embedding_cache(embedding_cache)
+    numeric_features = df[["speed_band", "type_score", "type_match_score", "uncertainty_score"]].values
+
+    # === Labels ===
+    le = LabelEncoder()
+    labels = le.fit_transform(df["label"])  # 'verified' / 'false'
+
+    # === Train/test split ===
+    X_train_idx, X_test_idx, y_train, y_test = train_test_split(
+        np.arange(len(df)), labels, test_size=0.3, random_state=42, stratify=labels
+    )
 
-# === Train/test split ===
-X_train_idx, X_test_idx, y_train, y_test = train_test_split(
-    np.arange(len(df)), labels, test_size=0.3, random_state=42, stratify=labels
-)
+    # === Train RandomForest with cross-validation (no leakage) ===
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    cv_scores = []
 
-# === Train RandomForest with cross-validation (no leakage) ===
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-cv_scores = []
+    for train_idx, val_idx in cv.split(raw_embeddings, labels):
+        ranges_cv = fit_embedding_ranges(raw_embeddings[train_idx])
 
-for train_idx, val_idx in cv.split(text_embeddings, labels):
-    svd_cv = TruncatedSVD(n_components=100, random_state=42)
-    svd_cv.fit(text_embeddings[train_idx])
+        X_train_cv = np.hstack([
+            quantize(raw_embeddings[train_idx], ranges_cv),
+            numeric_features[train_idx]
+        ])
 
-    X_train_cv = np.hstack([
-        svd_cv.transform(text_embeddings[train_idx]),
-        numeric_features[train_idx]
-    ])
+        X_val_cv = np.hstack([
+            quantize(raw_embeddings[val_idx], ranges_cv),
+            numeric_features[val_idx]
+        ])
 
-    X_val_cv = np.hstack([
-        svd_cv.transform(text_embeddings[val_idx]),
-        numeric_features[val_idx]
-    ])
+        clf_cv = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
+        clf_cv.fit(X_train_cv, labels[train_idx])
+
+        val_pred = clf_cv.predict(X_val_cv)
+        cv_scores.append(f1_score(labels[val_idx], val_pred, average="weighted"))
 
-    clf_cv = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
-    clf_cv.fit(X_train_cv, labels[train_idx])
+    cv_scores = np.array(cv_scores)
+    print("5-Fold CV weighted F1 scores:", cv_scores)
+    print("Mean F1 score:", cv_scores.mean())
 
-    val_pred = clf_cv.predict(X_val_cv)
-    cv_scores.append(f1_score(labels[val_idx], val_pred, average="weighted"))
+    # === Hold-out evaluation ===
+    ranges_eval = fit_embedding_ranges(raw_embeddings[X_train_idx])
 
-cv_scores = np.array(cv_scores)
-print("5-Fold CV weighted F1 scores:", cv_scores)
-print("Mean F1 score:", cv_scores.mean())
+    X_train_eval = np.hstack([
+        quantize(raw_embeddings[X_train_idx], ranges_eval),
+        numeric_features[X_train_idx]
+    ])
 
-# === Hold-out evaluation ===
-svd_eval = TruncatedSVD(n_components=100, random_state=42)
-svd_eval.fit(text_embeddings[X_train_idx])
+    X_test_eval = np.hstack([
+        quantize(raw_embeddings[X_test_idx], ranges_eval),
+        numeric_features[X_test_idx]
+    ])
 
-X_train_eval = np.hstack([
-    svd_eval.transform(text_embeddings[X_train_idx]),
-    numeric_features[X_train_idx]
-])
+    clf_eval = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
+    clf_eval.fit(X_train_eval, y_train)
 
-X_test_eval = np.hstack([
-    svd_eval.transform(text_embeddings[X_test_idx]),
-    numeric_features[X_test_idx]
-])
+    y_pred = clf_eval.predict(X_test_eval)
 
-clf_eval = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
-clf_eval.fit(X_train_eval, y_train)
+    report = classification_report(
+        y_test,
+        y_pred,
+        target_names=le.classes_,
+        digits=2
+    )
 
-y_pred = clf_eval.predict(X_test_eval)
+    print("=== Model Evaluation (Hold-out) ===")
+    print(report)
 
-report = classification_report(
-    y_test,
-    y_pred,
-    target_names=le.classes_,
-    digits=2
-)
+    # === Train final model on full dataset for inference ===
+    embedding_ranges = fit_embedding_ranges(raw_embeddings)
 
-print("=== Model Evaluation (Hold-out) ===")
-print(report)
+    features_full = np.hstack([
+        quantize(raw_embeddings, embedding_ranges),
+        numeric_features
+    ])
 
-# === Train final model on full dataset for inference ===
-svd = TruncatedSVD(n_components=100, random_state=42)
-svd.fit(text_embeddings)
+    clf = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
+    clf.fit(features_full, labels)
+    print("✅ Model trained on full dataset for inference.")
 
-features_full = np.hstack([
-    svd.transform(text_embeddings),
-    numeric_features
-])
+    joblib.dump(clf, CLF_PATH, compress=3)
+    joblib.dump(embedding_ranges, EMBEDDING_RANGES_PATH)
+    joblib.dump(le, LABEL_ENCODER_PATH)
+    return clf, embedding_ranges, le
 
-clf = RandomForestClassifier(n_estimators=150, max_depth=15, min_samples_leaf=5, random_state=42)
-clf.fit(features_full, labels)
-print("✅ Model trained on full dataset for inference.")
+try:
+    clf = joblib.load(CLF_PATH)
+    embedding_ranges = joblib.load(EMBEDDING_RANGES_PATH)
+    le = joblib.load(LABEL_ENCODER_PATH)
+    print("✅ Loaded trained model from disk.")
+except FileNotFoundError:
+    clf, embedding_ranges, le = train_and_dump()
 
 # === Analyze new report ===
+# Reused single-row feature buffer: int8 embedding followed by the 4 numeric features
+EMBEDDING_DIM = model_text.get_sentence_embedding_dimension()
+_FEAT = np.empty((1, EMBEDDING_DIM + 4), dtype=np.float32)
+
 def analyze_report(description, road_name, incident_type, live_speed=None):
     # Fetch live speed from LTA if not provided
     if live_speed is None:
         live_speed = get_live_speed(road_name) or 5
 
-    emb = model_text.encode([description])
-    emb_reduced = svd.transform(emb)
+    emb = encode_messages([description], embedding_cache)
+    emb_int8 = quantize(emb, embedding_ranges)
 
     type_match = 1 if infer_type_from_message(description).lower() == incident_type.lower() else 0
     uncertainty = sum(word in description.lower() for word in uncertainty_keywords) / len(uncertainty_keywords)
 
-    feat = np.hstack([emb_reduced, [[live_speed, type_map.get(incident_type.lower(), 0), type_match, uncertainty]]])
-    pred = clf.predict(feat)
-    proba = clf.predict_proba(feat)[0]
+    _FEAT[0, :EMBEDDING_DIM] = emb_int8[0]
+    _FEAT[0, EMBEDDING_DIM] = live_speed
+    _FEAT[0, EMBEDDING_DIM + 1] = type_map.get(incident_type.lower(), 0)
+    _FEAT[0, EMBEDDING_DIM + 2] = type_match
+    _FEAT[0, EMBEDDING_DIM + 3] = uncertainty
+    pred = clf.predict(_FEAT)
+    proba = clf.predict_proba(_FEAT)[0]
     authenticity = le.inverse_transform(pred)[0]
     conf = {cls: round(prob, 2) for cls, prob in zip(le.classes_, proba)}
 
@@ -229,15 +363,9 @@ def analyze_report(description, road_name, incident_type, live_speed=None):
         print("ℹ️ No major red flags.")
 
 def fetch_road_names():
-    headers = {"AccountKey": ACCOUNT_KEY, "accept": "application/json"}
     try:
-        resp = requests.get(BASE_URL, headers=headers)
-        data = resp.json().get("value", [])
-
-        # Extract unique road names
-        road_names = list({entry["RoadName"] for entry in data})
-        return road_names
-
+        # Unique road names from the cached LTA index
+        return [entry["RoadName"] for entry in lta_road_index().values()]
     except Exception as e:
         print("⚠️ Error fetching LTA data:", e)
         return []